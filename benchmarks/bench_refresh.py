@@ -0,0 +1,71 @@
+"""
+Compares the CPU cost of obtaining a new access token by re-login (bcrypt password verification) against
+the refresh-token path (JWT verification, hashing the token id and a revocation list lookup). Neither
+path touches the database here, so only the work done on the request worker is measured.
+
+Run from the repository root with `python -m benchmarks.bench_refresh [sessions_per_hour]`.
+"""
+
+import sys
+import timeit
+import uuid
+from datetime import timedelta
+
+from project.login_user_service import (
+    create_access_token,
+    hash_token_id,
+    pwd_context,
+)
+from project.refresh_token_service import decode_refresh_token, revoked_tokens
+
+SESSIONS_PER_HOUR = 10000
+
+REVOKED_TOKENS = 100000
+
+
+def relogin(password: str, hashed_password: str) -> None:
+    assert pwd_context.verify(password, hashed_password)
+
+
+def refresh(refresh_token: str) -> None:
+    payload = decode_refresh_token(refresh_token)
+    assert hash_token_id(payload["jti"]) not in revoked_tokens
+
+
+def main() -> None:
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else SESSIONS_PER_HOUR
+    password = "correct horse battery staple"
+    hashed_password = pwd_context.hash(password)
+    refresh_token = create_access_token(
+        data={
+            "sub": "bench@example.com",
+            "jti": str(uuid.uuid4()),
+            "type": "refresh",
+        },
+        expires_delta=timedelta(days=1),
+    )
+    revoked_tokens.update(
+        (hash_token_id(str(uuid.uuid4())), None) for _ in range(REVOKED_TOKENS)
+    )
+    results = {
+        "re-login (bcrypt verify)": min(
+            timeit.repeat(lambda: relogin(password, hashed_password), number=5, repeat=3)
+        )
+        / 5,
+        "refresh (JWT + revocation lookup)": min(
+            timeit.repeat(lambda: refresh(refresh_token), number=2000, repeat=3)
+        )
+        / 2000,
+    }
+    print(f"{sessions:,} token renewals per hour, {REVOKED_TOKENS:,} revoked tokens")
+    for name, seconds in results.items():
+        print(
+            f"{name:<36} {seconds * 1e3:>9.3f} ms/op"
+            f" {seconds * sessions:>9.2f} CPU s/hour"
+        )
+    relogin_cost, refresh_cost = results.values()
+    print(f"refresh is {relogin_cost / refresh_cost:,.0f}x cheaper than re-login")
+
+
+if __name__ == "__main__":
+    main()
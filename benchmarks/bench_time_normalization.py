@@ -0,0 +1,80 @@
+"""
+Measures the throughput of converting local booking times to UTC.
+
+* baseline: `strptime` plus the standard (internally cached) `ZoneInfo` lookup for every slot.
+* cold: `local_to_utc_many` with its parse and conversion caches cleared before each run, i.e. the
+  first time a listing is served.
+* warm: `local_to_utc_many` with the caches already populated, i.e. the same listing served again.
+
+Run from the repository root with `python -m benchmarks.bench_time_normalization`.
+"""
+
+import timeit
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from project.time_normalization import (
+    LOCAL_DATETIME_FORMAT,
+    _parse_local,
+    local_to_utc,
+    local_to_utc_many,
+)
+
+ZONE = "America/New_York"
+
+DAYS = 14
+
+REPEATS = 20
+
+
+def build_slots() -> list:
+    """
+    Builds the (date, time) pairs of a two-week availability listing with 30-minute slots from 08:00 to 18:00.
+    """
+    start = datetime(2026, 3, 1)
+    return [
+        (
+            (start + timedelta(days=day)).strftime("%Y-%m-%d"),
+            f"{minutes // 60:02d}:{minutes % 60:02d}",
+        )
+        for day in range(DAYS)
+        for minutes in range(8 * 60, 18 * 60, 30)
+    ]
+
+
+def convert_baseline(slots: list) -> list:
+    return [
+        datetime.strptime(f"{date} {time}", LOCAL_DATETIME_FORMAT)
+        .replace(tzinfo=ZoneInfo(ZONE))
+        .astimezone(timezone.utc)
+        for date, time in slots
+    ]
+
+
+def convert_cold(slots: list) -> list:
+    local_to_utc.cache_clear()
+    _parse_local.cache_clear()
+    return local_to_utc_many(slots, ZONE)
+
+
+def convert_warm(slots: list) -> list:
+    return local_to_utc_many(slots, ZONE)
+
+
+def main() -> None:
+    slots = build_slots()
+    assert convert_baseline(slots) == convert_cold(slots)
+    print(f"{len(slots)} slots in {ZONE}")
+    for name, func in (
+        ("baseline strptime + ZoneInfo", convert_baseline),
+        ("local_to_utc_many (cold cache)", convert_cold),
+        ("local_to_utc_many (warm cache)", convert_warm),
+    ):
+        func(slots)
+        seconds = min(timeit.repeat(lambda: func(slots), number=REPEATS, repeat=5))
+        rate = len(slots) * REPEATS / seconds
+        print(f"{name:<32} {rate:>12,.0f} conversions/s")
+
+
+if __name__ == "__main__":
+    main()
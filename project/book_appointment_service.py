@@ -1,9 +1,14 @@
-from datetime import datetime
+from typing import Optional
 
 import prisma
 import prisma.enums
 import prisma.models
-import pytz
+from project.time_normalization import (
+    get_zone,
+    local_to_utc_many,
+    utc_now,
+    utc_to_local_many,
+)
 from pydantic import BaseModel
 
 
@@ -19,6 +24,8 @@ class BookAppointmentResponse(BaseModel):
     startTime: str
     endTime: str
     status: str
+    professionalStartTime: Optional[str] = None
+    professionalEndTime: Optional[str] = None
 
 
 async def book_appointment(
@@ -32,24 +39,44 @@ async def book_appointment(
     Allows a client to book an appointment with a professional.
     This function first checks the availability of the professional for the given date and time,
     then books an appointment if possible, and finally returns the details of the appointment.
+    The requested date and times are interpreted in the client's `Profile.timeZone` and normalized to UTC
+    before being compared with stored schedules; the confirmed slot is also reported in the professional's zone as ISO 8601 datetimes,
+    since the two zones may fall on different calendar days.
 
     Args:
         clientId (str): Unique identifier for the client booking the appointment.
         professionalId (str): Unique identifier for the professional with whom the appointment is being booked.
         appointmentDate (str): The desired date for the appointment in 'YYYY-MM-DD' format.
-        startTime (str): The starting time for the appointment in 'HH:MM' format.
-        endTime (str): The ending time for the appointment in 'HH:MM' format.
+        startTime (str): The starting time for the appointment in 'HH:MM' format, in the client's time zone.
+        endTime (str): The ending time for the appointment in 'HH:MM' format, in the client's time zone.
 
     Returns:
         BookAppointmentResponse: Confirms the details of the booked appointment including identifiers and timing.
 
     Raises:
-        ValueError: If the time input is invalid or if the professional is not available at the given time.
+        ValueError: If the time input is invalid, if either party has no profile or an unrecognised time zone,
+            or if the professional is not available at the given time.
     """
-    start_datetime = datetime.strptime(
-        f"{appointmentDate} {startTime}", "%Y-%m-%d %H:%M"
+    profiles = await prisma.models.Profile.prisma().find_many(
+        where={"userId": {"in": [clientId, professionalId]}}
+    )
+    zones = {profile.userId: profile.timeZone for profile in profiles}
+    for role, userId in (("client", clientId), ("professional", professionalId)):
+        if userId not in zones:
+            raise ValueError(f"No profile found for the {role}.")
+        try:
+            get_zone(zones[userId])
+        except ValueError:
+            # Profiles saved before time zones were validated may hold names such as 'PST'.
+            raise ValueError(
+                f"The {role}'s profile has an unrecognised time zone '{zones[userId]}'; "
+                "it must be updated to an IANA time zone name."
+            )
+    client_zone = zones[clientId]
+    professional_zone = zones[professionalId]
+    start_datetime, end_datetime = local_to_utc_many(
+        [(appointmentDate, startTime), (appointmentDate, endTime)], client_zone
     )
-    end_datetime = datetime.strptime(f"{appointmentDate} {endTime}", "%Y-%m-%d %H:%M")
     if start_datetime >= end_datetime:
         raise ValueError("The appointment's end time must be after its start time.")
     schedules = await prisma.models.Schedule.prisma().find_many(
@@ -66,10 +93,13 @@ async def book_appointment(
             "clientId": clientId,
             "professionalId": professionalId,
             "scheduleId": schedules[0].id,
-            "createdAt": datetime.now(tz=pytz.UTC),
+            "createdAt": utc_now(),
             "status": prisma.enums.AppointmentStatus.Pending,
         }
     )
+    professional_start, professional_end = utc_to_local_many(
+        [start_datetime, end_datetime], professional_zone
+    )
     return BookAppointmentResponse(
         appointmentId=appointment.id,
         clientId=appointment.clientId,
@@ -78,4 +108,6 @@ async def book_appointment(
         startTime=startTime,
         endTime=endTime,
         status=appointment.status,
+        professionalStartTime=professional_start.isoformat(),
+        professionalEndTime=professional_end.isoformat(),
     )
@@ -0,0 +1,356 @@
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import prisma
+import prisma.enums
+import prisma.models
+from fastapi.encoders import jsonable_encoder
+from prisma import Prisma
+from project.time_normalization import utc_now
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_ROWS_PER_FILE = 100000
+
+# Must point at storage shared by the API and the export worker, e.g. a bucket mounted into both.
+EXPORT_OUTPUT_DIR = os.environ.get("EXPORT_OUTPUT_DIR", "exports")
+
+EXPORT_JOB_RETENTION_HOURS = 24
+
+EXPORT_JOB_STALE_MINUTES = 30
+
+EXPORT_POLL_SECONDS = 10
+
+EXPORTABLE_MODELS = ("Appointment", "Schedule")
+
+
+class ExportJobResponse(BaseModel):
+    """
+    Reports the state of a history export job, including its progress, throughput and the files written so far.
+    """
+
+    jobId: str
+    model: str
+    status: str
+    since: Optional[datetime] = None
+    nextSince: Optional[datetime] = None
+    rowsExported: int
+    bytesWritten: int
+    rowsPerSecond: float
+    files: List[str]
+    createdAt: datetime
+    startedAt: Optional[datetime] = None
+    finishedAt: Optional[datetime] = None
+    error: Optional[str] = None
+
+
+def _to_response(job: prisma.models.ExportJob) -> ExportJobResponse:
+    return ExportJobResponse(
+        jobId=job.id,
+        model=job.model,
+        status=job.status,
+        since=job.since,
+        nextSince=job.nextSince,
+        rowsExported=job.rowsExported,
+        bytesWritten=job.bytesWritten,
+        rowsPerSecond=job.rowsPerSecond,
+        files=job.files,
+        createdAt=job.createdAt,
+        startedAt=job.startedAt,
+        finishedAt=job.finishedAt,
+        error=job.error,
+    )
+
+
+async def start_export(model: str, since: Optional[datetime] = None) -> ExportJobResponse:
+    """
+    Queues an export job for the given model. The rows themselves are written by the export worker
+    (`python -m project.export_history_service`), which runs outside the API process.
+
+    Only one export may be queued or running at a time. A running job that has made no progress for
+    `EXPORT_JOB_STALE_MINUTES` is assumed to belong to a worker that died and no longer blocks new jobs.
+
+    Args:
+        model (str): The model to export, either "Appointment" or "Schedule".
+        since (Optional[datetime]): Only rows updated strictly after this time are exported. Pass the
+            `nextSince` of a previous job to export incrementally.
+
+    Returns:
+        ExportJobResponse: The newly queued job in the "Pending" state.
+
+    Raises:
+        ValueError: If the model is not exportable or another export is still in progress.
+    """
+    if model not in EXPORTABLE_MODELS:
+        raise ValueError(
+            f"Unsupported export model '{model}', expected one of {', '.join(EXPORTABLE_MODELS)}."
+        )
+    stale = utc_now() - timedelta(minutes=EXPORT_JOB_STALE_MINUTES)
+    active = await prisma.models.ExportJob.prisma().find_first(
+        where={
+            "OR": [
+                {"status": prisma.enums.ExportJobStatus.Pending},
+                {
+                    "status": prisma.enums.ExportJobStatus.Running,
+                    "updatedAt": {"gt": stale},
+                },
+            ]
+        }
+    )
+    if active:
+        raise ValueError(
+            f"Export job {active.id} is still {active.status}; wait for it to finish."
+        )
+    data = {"model": model, "files": []}
+    if since:
+        data.update({"since": since, "nextSince": since})
+    job = await prisma.models.ExportJob.prisma().create(data=data)
+    return _to_response(job)
+
+
+async def get_export(jobId: str) -> ExportJobResponse:
+    """
+    Retrieves the current state of an export job.
+
+    Args:
+        jobId (str): The identifier of the export job.
+
+    Returns:
+        ExportJobResponse: The job's status, progress and throughput.
+
+    Raises:
+        ValueError: If no job with the given identifier exists.
+    """
+    job = await prisma.models.ExportJob.prisma().find_unique(where={"id": jobId})
+    if not job:
+        raise ValueError("Export job not found.")
+    return _to_response(job)
+
+
+async def get_export_file(jobId: str, index: int) -> str:
+    """
+    Resolves one of the files written by a completed export job for download.
+
+    Args:
+        jobId (str): The identifier of the export job.
+        index (int): The position of the file in the job's `files` list.
+
+    Returns:
+        str: The path of the file under `EXPORT_OUTPUT_DIR`.
+
+    Raises:
+        ValueError: If the job does not exist, has not completed, or has no such file.
+    """
+    job = await get_export(jobId)
+    if job.status != prisma.enums.ExportJobStatus.Completed:
+        raise ValueError("Export job has not completed.")
+    if not 0 <= index < len(job.files):
+        raise ValueError("Export file not found.")
+    path = os.path.join(EXPORT_OUTPUT_DIR, job.files[index])
+    if not os.path.exists(path):
+        raise ValueError("Export file not found.")
+    return path
+
+
+def _write_rows(f: gzip.GzipFile, rows: list) -> None:
+    """
+    Encodes a batch of rows as NDJSON into an open gzip file.
+
+    Args:
+        f (gzip.GzipFile): The export file being written.
+        rows (list): The model instances to write, one per line.
+    """
+    for row in rows:
+        f.write(json.dumps(jsonable_encoder(row), separators=(",", ":")).encode())
+        f.write(b"\n")
+
+
+async def run_export(client: Prisma, job: prisma.models.ExportJob) -> None:
+    """
+    Streams the rows of an export job from the database and writes them to chunked, gzip-compressed
+    NDJSON files under `EXPORT_OUTPUT_DIR`.
+
+    Rows are read in keyset-paginated batches ordered by (`updatedAt`, `id`), so only one batch is held in
+    memory at a time and the scan never re-reads earlier rows. Each page resumes strictly after the last
+    (`updatedAt`, `id`) pair seen, so rows updated or deleted during the export cannot shift the scan.
+    Progress is written back to the job as each batch is written.
+
+    Args:
+        client (Prisma): The export worker's database client.
+        job (prisma.models.ExportJob): A job already claimed by this worker.
+    """
+    started = time.monotonic()
+    os.makedirs(EXPORT_OUTPUT_DIR, exist_ok=True)
+    table = getattr(client, job.model.lower())
+    base = {"updatedAt": {"gt": job.since}} if job.since else {}
+    where = base
+    files: List[str] = []
+    raw = None
+    out: Optional[gzip.GzipFile] = None
+    bytes_closed = 0
+    rows_exported = 0
+    rows_in_file = 0
+    try:
+        while True:
+            batch = await table.find_many(
+                where=where,
+                order=[{"updatedAt": "asc"}, {"id": "asc"}],
+                take=EXPORT_BATCH_SIZE,
+            )
+            if not batch:
+                break
+            if out is None or rows_in_file >= EXPORT_ROWS_PER_FILE:
+                if out is not None:
+                    out.close()
+                    bytes_closed += raw.tell()
+                    raw.close()
+                files.append(f"{job.model.lower()}-{job.id}-{len(files):05d}.ndjson.gz")
+                # Each file is written in one pass rather than appended to, since appends are costly
+                # on object-storage mounts.
+                raw = open(os.path.join(EXPORT_OUTPUT_DIR, files[-1]), "wb")
+                out = gzip.GzipFile(fileobj=raw, mode="wb")
+                rows_in_file = 0
+            _write_rows(out, batch)
+            rows_in_file += len(batch)
+            rows_exported += len(batch)
+            last = batch[-1]
+            await client.exportjob.update(
+                where={"id": job.id},
+                data={
+                    "files": {"set": files},
+                    "rowsExported": rows_exported,
+                    "bytesWritten": bytes_closed + raw.tell(),
+                    "rowsPerSecond": rows_exported
+                    / max(time.monotonic() - started, 1e-9),
+                    "nextSince": last.updatedAt,
+                },
+            )
+            where = {
+                **base,
+                "OR": [
+                    {"updatedAt": {"gt": last.updatedAt}},
+                    {"updatedAt": last.updatedAt, "id": {"gt": last.id}},
+                ],
+            }
+            if len(batch) < EXPORT_BATCH_SIZE:
+                break
+        if out is not None:
+            out.close()
+            bytes_closed += raw.tell()
+            raw.close()
+            out = None
+        await client.exportjob.update(
+            where={"id": job.id},
+            data={
+                "status": prisma.enums.ExportJobStatus.Completed,
+                "bytesWritten": bytes_closed,
+                "finishedAt": utc_now(),
+            },
+        )
+    except Exception as e:
+        logger.exception("Export job %s failed", job.id)
+        if out is not None:
+            out.close()
+            raw.close()
+        await client.exportjob.update(
+            where={"id": job.id},
+            data={
+                "status": prisma.enums.ExportJobStatus.Failed,
+                "error": str(e),
+                "finishedAt": utc_now(),
+            },
+        )
+
+
+async def prune_exports(client: Prisma) -> None:
+    """
+    Deletes jobs that finished more than `EXPORT_JOB_RETENTION_HOURS` ago, along with their files.
+
+    Args:
+        client (Prisma): The export worker's database client.
+    """
+    cutoff = utc_now() - timedelta(hours=EXPORT_JOB_RETENTION_HOURS)
+    jobs = await client.exportjob.find_many(where={"finishedAt": {"lt": cutoff}})
+    for job in jobs:
+        for name in job.files:
+            path = os.path.join(EXPORT_OUTPUT_DIR, name)
+            if os.path.exists(path):
+                os.remove(path)
+        await client.exportjob.delete(where={"id": job.id})
+
+
+async def run_pending_exports(client: Prisma) -> int:
+    """
+    Claims and runs queued export jobs one at a time, oldest first, until none are left.
+
+    A job is claimed by moving it from "Pending" to "Running" in a single conditional update, so several
+    workers can poll the same queue without running a job twice.
+
+    Args:
+        client (Prisma): The export worker's database client.
+
+    Returns:
+        int: The number of jobs run.
+    """
+    ran = 0
+    while True:
+        job = await client.exportjob.find_first(
+            where={"status": prisma.enums.ExportJobStatus.Pending},
+            order={"createdAt": "asc"},
+        )
+        if not job:
+            return ran
+        claimed = await client.exportjob.update_many(
+            where={"id": job.id, "status": prisma.enums.ExportJobStatus.Pending},
+            data={
+                "status": prisma.enums.ExportJobStatus.Running,
+                "startedAt": utc_now(),
+            },
+        )
+        if claimed:
+            await run_export(client, job)
+            ran += 1
+
+
+async def main(watch: bool = False) -> None:
+    """
+    Entry point of the export worker. Runs every queued export and exits, or with `watch` keeps polling
+    the queue every `EXPORT_POLL_SECONDS`.
+
+    Args:
+        watch (bool): Whether to keep polling for new jobs instead of exiting once the queue is empty.
+    """
+    client = Prisma()
+    await client.connect()
+    try:
+        while True:
+            await prune_exports(client)
+            await run_pending_exports(client)
+            if not watch:
+                break
+            await asyncio.sleep(EXPORT_POLL_SECONDS)
+    finally:
+        await client.disconnect()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(
+        description="Run queued appointment and schedule history exports."
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep polling for new export jobs instead of exiting when none are queued",
+    )
+    asyncio.run(main(watch=parser.parse_args().watch))
@@ -1,9 +1,14 @@
+import hashlib
+import uuid
 from datetime import datetime, timedelta
+from typing import Optional
 
 import prisma
+import prisma.enums
 import prisma.models
-from fastapi import HTTPException, status
-from jose import jwt
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from jose import JWTError, jwt
 from passlib.context import CryptContext
 from pydantic import BaseModel
 
@@ -15,6 +20,7 @@ class LoginResponse(BaseModel):
 
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
 
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -25,6 +31,10 @@ ALGORITHM = "HS256"
 
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="users/login")
+
+REFRESH_TOKEN_EXPIRE_DAYS = 30
+
 
 async def verify_password(plain_password, hashed_password) -> bool:
     """
@@ -90,6 +100,96 @@ def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
     return encoded_jwt
 
 
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    """
+    Resolves the user behind a bearer access token. Intended to be used as a FastAPI dependency.
+
+    Args:
+        token (str): The access JWT from the `Authorization: Bearer` header.
+
+    Returns:
+        The User model instance the token was issued to.
+
+    Raises:
+        HTTPException: If the token is invalid, expired, not an access token, or its user no longer exists.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise credentials_exception
+    if payload.get("type") != "access" or not payload.get("sub"):
+        raise credentials_exception
+    user = await get_user(payload["sub"])
+    if not user:
+        raise credentials_exception
+    return user
+
+
+async def require_admin(user=Depends(get_current_user)):
+    """
+    Restricts a route to users with the Admin role. Intended to be used as a FastAPI dependency.
+
+    Args:
+        user: The authenticated User model instance.
+
+    Returns:
+        The authenticated User model instance.
+
+    Raises:
+        HTTPException: If the user is not an admin.
+    """
+    if user.role != prisma.enums.Role.Admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    return user
+
+
+def hash_token_id(token_id: str) -> str:
+    """
+    Hashes a refresh token identifier for storage. A fast hash is sufficient because the identifier is a
+    random UUID rather than a user-chosen secret.
+
+    Args:
+        token_id (str): The `jti` claim of a refresh token.
+
+    Returns:
+        str: The hex-encoded SHA-256 digest of the identifier.
+    """
+    return hashlib.sha256(token_id.encode()).hexdigest()
+
+
+async def create_refresh_token(user) -> str:
+    """
+    Generates a long-lived refresh token for a user and records its hashed identifier so it can be revoked.
+
+    Args:
+        user: The User model instance the token is issued to.
+
+    Returns:
+        str: The generated refresh JWT.
+    """
+    token_id = str(uuid.uuid4())
+    expires_delta = timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    await prisma.models.RefreshToken.prisma().create(
+        data={
+            "tokenHash": hash_token_id(token_id),
+            "userId": user.id,
+            "expiresAt": datetime.utcnow() + expires_delta,
+        }
+    )
+    return create_access_token(
+        data={"sub": user.email, "jti": token_id, "type": "refresh"},
+        expires_delta=expires_delta,
+    )
+
+
 async def login_user(email: str, password: str) -> LoginResponse:
     """
     Authenticates user credentials and returns an access token.
@@ -99,7 +199,8 @@ async def login_user(email: str, password: str) -> LoginResponse:
         password (str): The password for the user which will be verified for authentication.
 
     Returns:
-        LoginResponse: The response provided after a user successfully logs in, containing the JWT token for accessing protected routes.
+        LoginResponse: The response provided after a user successfully logs in, containing the JWT token for accessing protected routes
+        and a refresh token that can be exchanged for new access tokens without re-entering the password.
     """
     user = await authenticate_user(email, password)
     if not user:
@@ -110,6 +211,10 @@ async def login_user(email: str, password: str) -> LoginResponse:
         )
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data={"sub": user.email, "type": "access"},
+        expires_delta=access_token_expires,
+    )
+    refresh_token = await create_refresh_token(user)
+    return LoginResponse(
+        access_token=access_token, token_type="bearer", refresh_token=refresh_token
     )
-    return LoginResponse(access_token=access_token, token_type="bearer")
@@ -0,0 +1,177 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+import prisma
+import prisma.models
+from fastapi import HTTPException, status
+from jose import JWTError, jwt
+from project.login_user_service import (
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    ALGORITHM,
+    SECRET_KEY,
+    LoginResponse,
+    create_access_token,
+    hash_token_id,
+)
+from project.time_normalization import utc_now
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshTokenRequest(BaseModel):
+    """
+    Carries a refresh token in the request body so the long-lived credential stays out of URLs and access logs.
+    """
+
+    refresh_token: str
+
+
+class RevokeTokenResponse(BaseModel):
+    """
+    Confirms that a refresh token has been revoked and can no longer be used to obtain access tokens.
+    """
+
+    success: bool
+    message: str
+
+
+REVOCATION_SYNC_SECONDS = 30
+
+# Maps the hash of each revoked, unexpired refresh token to its expiry.
+revoked_tokens: Dict[str, datetime] = {}
+
+revocation_sync_watermark: Optional[datetime] = None
+
+# Refreshes are refused until the revocation list has been loaded at least once.
+revocations_loaded = False
+
+
+async def sync_revoked_tokens() -> None:
+    """
+    Loads revoked refresh token hashes from the database into the in-memory revocation list and drops
+    entries whose tokens have expired, since those are rejected by their `exp` claim anyway.
+
+    The first call loads every revoked token that has not yet expired; later calls only fetch tokens
+    revoked since the previous sync, so other workers' revocations are picked up cheaply.
+    """
+    global revocation_sync_watermark, revocations_loaded
+    now = utc_now()
+    where = {"revokedAt": {"not": None}, "expiresAt": {"gt": now}}
+    if revocation_sync_watermark:
+        where["revokedAt"] = {"gt": revocation_sync_watermark}
+    tokens = await prisma.models.RefreshToken.prisma().find_many(where=where)
+    revoked_tokens.update((token.tokenHash, token.expiresAt) for token in tokens)
+    for token_hash, expires_at in list(revoked_tokens.items()):
+        if expires_at <= now:
+            del revoked_tokens[token_hash]
+    # Overlap the next window slightly so revocations committed during this query are not missed.
+    revocation_sync_watermark = now - timedelta(seconds=REVOCATION_SYNC_SECONDS)
+    revocations_loaded = True
+
+
+async def sync_revoked_tokens_periodically() -> None:
+    """
+    Keeps the revocation list in step with the database for the lifetime of the app. Meant to be run
+    as a background task started from the app's lifespan. Failed syncs are logged and retried on the
+    next tick, which also covers a failed initial load at startup.
+    """
+    while True:
+        await asyncio.sleep(REVOCATION_SYNC_SECONDS)
+        try:
+            await sync_revoked_tokens()
+        except Exception:
+            logger.exception("Error syncing revoked refresh tokens")
+
+
+def decode_refresh_token(refresh_token: str) -> dict:
+    """
+    Validates a refresh token's signature, expiry and type.
+
+    Args:
+        refresh_token (str): The refresh JWT issued at login.
+
+    Returns:
+        dict: The token's claims.
+
+    Raises:
+        HTTPException: If the token is invalid, expired or not a refresh token.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        payload = jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise credentials_exception
+    if payload.get("type") != "refresh" or not payload.get("jti"):
+        raise credentials_exception
+    return payload
+
+
+async def refresh_access_token(refresh_token: str) -> LoginResponse:
+    """
+    Issues a new access token in exchange for a valid refresh token.
+
+    The token is verified from its signature and a constant-time lookup in the in-memory revocation list,
+    so neither password verification nor a database query is needed.
+
+    Args:
+        refresh_token (str): The refresh JWT issued at login.
+
+    Returns:
+        LoginResponse: A new access token; the same refresh token remains valid until it expires or is revoked.
+
+    Raises:
+        HTTPException: If the token is invalid, expired or revoked, or the revocation list has not been
+            loaded yet.
+    """
+    if not revocations_loaded:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Token refresh is temporarily unavailable; please log in again",
+        )
+    payload = decode_refresh_token(refresh_token)
+    if hash_token_id(payload["jti"]) in revoked_tokens:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    access_token = create_access_token(
+        data={"sub": payload["sub"], "type": "access"},
+        expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+    )
+    return LoginResponse(
+        access_token=access_token, token_type="bearer", refresh_token=refresh_token
+    )
+
+
+async def revoke_refresh_token(refresh_token: str) -> RevokeTokenResponse:
+    """
+    Revokes a refresh token so it can no longer be exchanged for access tokens.
+
+    Args:
+        refresh_token (str): The refresh JWT to revoke.
+
+    Returns:
+        RevokeTokenResponse: Confirms whether the token was revoked.
+    """
+    payload = decode_refresh_token(refresh_token)
+    token_hash = hash_token_id(payload["jti"])
+    revoked = await prisma.models.RefreshToken.prisma().update_many(
+        where={"tokenHash": token_hash, "revokedAt": None},
+        data={"revokedAt": utc_now()},
+    )
+    revoked_tokens[token_hash] = datetime.fromtimestamp(
+        payload["exp"], tz=timezone.utc
+    )
+    if not revoked:
+        return RevokeTokenResponse(
+            success=False, message="The refresh token is already revoked."
+        )
+    return RevokeTokenResponse(success=True, message="Refresh token revoked.")
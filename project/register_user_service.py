@@ -1,6 +1,7 @@
 import prisma
 import prisma.models
 from passlib.hash import bcrypt
+from project.time_normalization import get_zone
 from pydantic import BaseModel
 
 
@@ -30,10 +31,14 @@ async def register_user(
     Returns:
         UserRegistrationResponse: After successful registration, this model returns a confirmation message and the user's unique identifier.
 
+    Raises:
+        ValueError: If the time zone is not a known IANA time zone name.
+
     Example:
         register_user("john.doe@example.com", "securePassword123", "John", "Doe", "Europe/London")
         > UserRegistrationResponse(success=True, user_id="...", message="User successfully registered.")
     """
+    get_zone(time_zone)
     existing_user = await prisma.models.User.prisma().find_unique(
         where={"email": email}
     )
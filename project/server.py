@@ -1,18 +1,22 @@
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+import os
+from contextlib import asynccontextmanager, suppress
 from datetime import datetime
 from typing import Optional
 
 import project.book_appointment_service
 import project.cancel_appointment_service
+import project.export_history_service
 import project.get_user_profile_service
 import project.login_user_service
+import project.refresh_token_service
 import project.register_user_service
 import project.update_appointment_service
 import project.update_user_profile_service
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, HTTPException
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import Response
+from fastapi.responses import FileResponse, Response
 from prisma import Prisma
 
 logger = logging.getLogger(__name__)
@@ -23,7 +27,19 @@ db_client = Prisma(auto_register=True)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await db_client.connect()
+    # A failed revocation sync must not keep bookings from being served; refreshes are refused until
+    # the periodic task manages to load the revocation list.
+    try:
+        await project.refresh_token_service.sync_revoked_tokens()
+    except Exception:
+        logger.exception("Error loading revoked refresh tokens")
+    revocation_sync = asyncio.create_task(
+        project.refresh_token_service.sync_revoked_tokens_periodically()
+    )
     yield
+    revocation_sync.cancel()
+    with suppress(asyncio.CancelledError):
+        await revocation_sync
     await db_client.disconnect()
 
 
@@ -215,3 +231,132 @@ async def api_post_login_user(
             status_code=500,
             media_type="application/json",
         )
+
+
+@app.post(
+    "/admin/exports",
+    response_model=project.export_history_service.ExportJobResponse,
+    dependencies=[Depends(project.login_user_service.require_admin)],
+)
+async def api_post_start_export(
+    model: str, since: Optional[datetime] = None
+) -> project.export_history_service.ExportJobResponse | Response:
+    """
+    Queues an export of appointment or schedule history to compressed NDJSON files.
+    """
+    try:
+        res = await project.export_history_service.start_export(model, since)
+        return res
+    except Exception as e:
+        logger.exception("Error processing request")
+        res = dict()
+        res["error"] = str(e)
+        return Response(
+            content=jsonable_encoder(res),
+            status_code=500,
+            media_type="application/json",
+        )
+
+
+@app.get(
+    "/admin/exports/{jobId}",
+    response_model=project.export_history_service.ExportJobResponse,
+    dependencies=[Depends(project.login_user_service.require_admin)],
+)
+async def api_get_export(
+    jobId: str,
+) -> project.export_history_service.ExportJobResponse | Response:
+    """
+    Reports the progress and throughput of an export job.
+    """
+    try:
+        res = await project.export_history_service.get_export(jobId)
+        return res
+    except Exception as e:
+        logger.exception("Error processing request")
+        res = dict()
+        res["error"] = str(e)
+        return Response(
+            content=jsonable_encoder(res),
+            status_code=500,
+            media_type="application/json",
+        )
+
+
+@app.post(
+    "/users/token/refresh", response_model=project.login_user_service.LoginResponse
+)
+async def api_post_refresh_token(
+    request: project.refresh_token_service.RefreshTokenRequest,
+) -> project.login_user_service.LoginResponse | Response:
+    """
+    Exchanges a refresh token for a new access token without re-entering the password.
+    """
+    try:
+        res = await project.refresh_token_service.refresh_access_token(
+            request.refresh_token
+        )
+        return res
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error processing request")
+        res = dict()
+        res["error"] = str(e)
+        return Response(
+            content=jsonable_encoder(res),
+            status_code=500,
+            media_type="application/json",
+        )
+
+
+@app.post(
+    "/users/token/revoke",
+    response_model=project.refresh_token_service.RevokeTokenResponse,
+)
+async def api_post_revoke_token(
+    request: project.refresh_token_service.RefreshTokenRequest,
+) -> project.refresh_token_service.RevokeTokenResponse | Response:
+    """
+    Revokes a refresh token so it can no longer be used.
+    """
+    try:
+        res = await project.refresh_token_service.revoke_refresh_token(
+            request.refresh_token
+        )
+        return res
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error processing request")
+        res = dict()
+        res["error"] = str(e)
+        return Response(
+            content=jsonable_encoder(res),
+            status_code=500,
+            media_type="application/json",
+        )
+
+
+@app.get(
+    "/admin/exports/{jobId}/files/{index}",
+    dependencies=[Depends(project.login_user_service.require_admin)],
+)
+async def api_get_export_file(jobId: str, index: int) -> FileResponse | Response:
+    """
+    Downloads one of the compressed NDJSON files written by a completed export job.
+    """
+    try:
+        path = await project.export_history_service.get_export_file(jobId, index)
+        return FileResponse(
+            path, media_type="application/gzip", filename=os.path.basename(path)
+        )
+    except Exception as e:
+        logger.exception("Error processing request")
+        res = dict()
+        res["error"] = str(e)
+        return Response(
+            content=jsonable_encoder(res),
+            status_code=500,
+            media_type="application/json",
+        )
@@ -0,0 +1,114 @@
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+LOCAL_DATETIME_FORMAT = "%Y-%m-%d %H:%M"
+
+
+@lru_cache(maxsize=None)
+def get_zone(name: str) -> ZoneInfo:
+    """
+    Resolves an IANA time zone name to a zone object. The zone, along with its DST transition table,
+    is loaded once per process and reused for every later conversion.
+
+    Args:
+        name (str): The IANA name of the time zone, e.g. 'Europe/London'.
+
+    Returns:
+        ZoneInfo: The resolved time zone.
+
+    Raises:
+        ValueError: If the time zone name is unknown.
+    """
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown time zone '{name}'.")
+
+
+@lru_cache(maxsize=4096)
+def _parse_local(date: str, time: str) -> datetime:
+    return datetime.strptime(f"{date} {time}", LOCAL_DATETIME_FORMAT)
+
+
+@lru_cache(maxsize=65536)
+def local_to_utc(date: str, time: str, zone: str) -> datetime:
+    """
+    Converts a wall-clock date and time in the given zone to an aware UTC datetime.
+
+    Times skipped by a DST transition (e.g. 02:30 on a spring-forward night) are rejected. Times that occur
+    twice when clocks go back resolve to the first occurrence, i.e. the one before the transition (`fold=0`).
+
+    Args:
+        date (str): The local date in 'YYYY-MM-DD' format.
+        time (str): The local time in 'HH:MM' format.
+        zone (str): The IANA name of the time zone the date and time are expressed in.
+
+    Returns:
+        datetime: The equivalent aware datetime in UTC.
+
+    Raises:
+        ValueError: If the date, time or time zone is invalid, or the time does not exist in the zone.
+    """
+    tz = get_zone(zone)
+    local = _parse_local(date, time).replace(tzinfo=tz, fold=0)
+    utc = local.astimezone(timezone.utc)
+    if utc.astimezone(tz).replace(tzinfo=None) != local.replace(tzinfo=None):
+        raise ValueError(f"{date} {time} does not exist in time zone '{zone}'.")
+    return utc
+
+
+def utc_to_local(value: datetime, zone: str) -> datetime:
+    """
+    Converts a datetime to wall-clock time in the given zone. Naive datetimes, as returned for
+    timestamps stored by the database, are treated as UTC.
+
+    Args:
+        value (datetime): The datetime to convert.
+        zone (str): The IANA name of the target time zone.
+
+    Returns:
+        datetime: The equivalent aware datetime in the target zone.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(get_zone(zone))
+
+
+def local_to_utc_many(values: Iterable[Tuple[str, str]], zone: str) -> List[datetime]:
+    """
+    Converts a batch of wall-clock (date, time) pairs in a single zone to UTC. The zone is resolved once
+    for the whole batch and repeated slots are served from the conversion cache, which is the common
+    case for availability and listing pages.
+
+    Args:
+        values (Iterable[Tuple[str, str]]): The (date, time) pairs in 'YYYY-MM-DD' and 'HH:MM' format.
+        zone (str): The IANA name of the time zone the pairs are expressed in.
+
+    Returns:
+        List[datetime]: The equivalent aware UTC datetimes, in input order.
+    """
+    get_zone(zone)
+    return [local_to_utc(date, time, zone) for date, time in values]
+
+
+def utc_to_local_many(values: Iterable[datetime], zone: str) -> List[datetime]:
+    """
+    Converts a batch of datetimes to wall-clock time in a single zone.
+
+    Args:
+        values (Iterable[datetime]): The datetimes to convert. Naive values are treated as UTC.
+        zone (str): The IANA name of the target time zone.
+
+    Returns:
+        List[datetime]: The equivalent aware datetimes in the target zone, in input order.
+    """
+    return [utc_to_local(value, zone) for value in values]
+
+
+def utc_now() -> datetime:
+    """
+    Returns the current time as an aware UTC datetime.
+    """
+    return datetime.now(tz=timezone.utc)
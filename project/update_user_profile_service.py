@@ -2,6 +2,7 @@ from typing import List, Optional
 
 import prisma
 import prisma.models
+from project.time_normalization import get_zone
 from pydantic import BaseModel
 
 
@@ -34,7 +35,12 @@ async def update_user_profile(
 
     Returns:
       UpdateUserProfileResponse: Confirms the successful update of the user's profile along with a summary of the updated fields.
+
+    Raises:
+      ValueError: If the user does not exist or the time zone is unknown.
     """
+    if timeZone:
+        get_zone(timeZone)
     updated_fields = []
     user = await prisma.models.User.prisma().find_unique(where={"id": userId})
     if user is None: